@@ -0,0 +1,198 @@
+import argparse
+import contextvars
+import json
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from dotenv import load_dotenv
+
+# --- 1. Load Environment Variables ---
+load_dotenv()
+
+# Importing the agent warms up the embedding model and LangChain once for every project.
+from src.agent.agent import EXECUTION_MODES, run_agent
+from src.agent.complexity import load_routing_policy
+from langchain_core.rate_limiters import InMemoryRateLimiter
+from src.document import DocumentStore
+
+# The log file of the project being documented in the current thread (None on the main thread).
+_project_log = contextvars.ContextVar("project_log", default=None)
+
+
+class ProjectLogRouter:
+    """
+    Stands in for sys.stdout while workers run: each print goes to the log file of
+    the project documented in the current context, so concurrent projects do not
+    interleave. LangChain and LangGraph copy the context into their own worker
+    threads, so their output follows the project too.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, text: str) -> int:
+        return (_project_log.get() or self.stream).write(text)
+
+    def flush(self):
+        (_project_log.get() or self.stream).flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+def load_manifest(manifest_path: str) -> list[dict]:
+    """
+    Reads the projects manifest. Accepted shapes:
+        {"projects": [{"name": "auth-service", "path": "/srv/auth-service", "mode": "agent"}, ...]}
+        [{"name": ..., "path": ...}, ...]
+    `name` defaults to the directory name and `mode` to the CLI's --mode. Relative
+    paths are resolved against the manifest's directory, not the working directory.
+    """
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    projects = data.get("projects", []) if isinstance(data, dict) else data
+    manifest_dir = os.path.dirname(os.path.abspath(manifest_path))
+
+    seen_names = set()
+    for project in projects:
+        if "path" not in project:
+            raise ValueError(f"Manifest entry is missing 'path': {project}")
+        project["path"] = os.path.normpath(os.path.join(manifest_dir, os.path.expanduser(project["path"])))
+        project.setdefault("name", os.path.basename(os.path.normpath(project["path"])))
+        if project["name"] in seen_names:
+            raise ValueError(f"Duplicate project name in manifest: {project['name']}")
+        seen_names.add(project["name"])
+    return projects
+
+
+def document_project(project: dict, output_dir: str, mode: str, layout: str, routing_policy, rate_limiter: InMemoryRateLimiter) -> dict:
+    """
+    Runs the agent on one project and writes its outputs as they are produced.
+    The project's DocumentStore lives in its output directory, so later runs only
+    regenerate files whose source changed; the run's console output goes to `run.log`
+    next to it.
+    """
+    project_dir = os.path.join(output_dir, project["name"])
+    store_path = os.path.join(project_dir, ".doc_store.json")
+    snippets_dir = os.path.join(project_dir, "snippets")
+    os.makedirs(snippets_dir, exist_ok=True)
+
+    def write_snippet(file_path: str, snippet: str):
+        snippet_path = os.path.join(snippets_dir, file_path + ".md")
+        os.makedirs(os.path.dirname(snippet_path), exist_ok=True)
+        with open(snippet_path, 'w', encoding='utf-8') as f:
+            f.write(snippet)
+
+    log_path = os.path.join(project_dir, "run.log")
+    summary = {"name": project["name"], "path": project["path"], "mode": project.get("mode", mode), "log": log_path}
+    started = time.perf_counter()
+    log_file = open(log_path, 'w', encoding='utf-8', buffering=1)
+    log_token = _project_log.set(log_file)
+    try:
+        _, report = run_agent(
+            project["path"],
+            mode=summary["mode"],
+            routing_policy=routing_policy,
+            rate_limiter=rate_limiter,
+            on_snippet=write_snippet,
+            store_path=store_path
+        )
+        store = DocumentStore.load(store_path)
+        if layout == "tree":
+            doc_path = os.path.join(project_dir, "docs")
+            store.write_tree(doc_path)
+        else:
+            doc_path = os.path.join(project_dir, "FINAL_DOCUMENTATION.md")
+            store.write_markdown(doc_path)
+        with open(os.path.join(project_dir, "report.json"), 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        files = report.get("files", [])
+        summary.update({
+            "status": report.get("status", "Complete"),
+            "files": len(files),
+            "regenerated": sum(1 for f in files if not f.get("reused")),
+            "failed_files": [f["file_path"] for f in files if f.get("error")],
+            "file_timings": {f["file_path"]: f.get("seconds") for f in files},
+            "output": doc_path,
+        })
+        if summary["status"] != "Complete":
+            summary["error"] = report.get("publisher_error") or report.get("feedback")
+    except Exception as e:
+        summary.update({
+            "status": "Failed",
+            "error": f"{type(e).__name__}: {e}",
+            "traceback": traceback.format_exc(),
+        })
+        print(summary["traceback"])
+    finally:
+        _project_log.reset(log_token)
+        log_file.close()
+    summary["seconds"] = round(time.perf_counter() - started, 2)
+    return summary
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Document many Spring Boot projects in one process.")
+    parser.add_argument("manifest", help="Path to a JSON manifest listing the projects to document.")
+    parser.add_argument("--output-dir", default="docs_output", help="Directory that receives one sub-directory per project.")
+    parser.add_argument("--workers", type=int, default=4, help="Number of projects documented concurrently.")
+    parser.add_argument("--calls-per-minute", type=float, default=10, help="LLM call budget shared by all workers.")
+    parser.add_argument("--mode", choices=EXECUTION_MODES, default="prefetched", help="Default execution mode for projects.")
+    parser.add_argument("--layout", choices=["single", "tree"], default="single",
+                        help="Write one FINAL_DOCUMENTATION.md, or a docs/ tree with one file per Java package.")
+    parser.add_argument("--routing-policy", help="JSON routing policy file (defaults to ROUTING_POLICY_PATH).")
+    parser.add_argument("--summary", help="Where to write the run summary (defaults to <output-dir>/summary.json).")
+    args = parser.parse_args(argv)
+
+    projects = load_manifest(args.manifest)
+    routing_policy = load_routing_policy(args.routing_policy)
+    # One limiter for the whole process: every model call of every worker draws from it.
+    rate_limiter = InMemoryRateLimiter(
+        requests_per_second=args.calls_per_minute / 60,
+        check_every_n_seconds=0.1,
+        max_bucket_size=1
+    )
+    os.makedirs(args.output_dir, exist_ok=True)
+    summary_path = args.summary or os.path.join(args.output_dir, "summary.json")
+
+    print(f"--- 🚀 Documenting {len(projects)} projects with {args.workers} workers ---")
+    started_at = datetime.now(timezone.utc).isoformat()
+    started = time.perf_counter()
+    results = []
+    sys.stdout = ProjectLogRouter(sys.stdout)
+    try:
+        with ThreadPoolExecutor(max_workers=args.workers) as executor:
+            futures = [
+                executor.submit(document_project, project, args.output_dir, args.mode, args.layout, routing_policy, rate_limiter)
+                for project in projects
+            ]
+            for future in as_completed(futures):
+                result = future.result()
+                results.append(result)
+                icon = {"Complete": "✅", "Partial": "⚠️"}.get(result["status"], "❌")
+                print(f"{icon} {result['name']}: {result['status']} in {result['seconds']}s (log: {result['log']})")
+    finally:
+        sys.stdout = sys.stdout.stream
+
+    failures = [r for r in results if r["status"] == "Failed"]
+    partial = [r for r in results if r["status"] == "Partial"]
+    summary = {
+        "started_at": started_at,
+        "seconds": round(time.perf_counter() - started, 2),
+        "projects": len(projects),
+        "succeeded": len(projects) - len(failures) - len(partial),
+        "partial": len(partial),
+        "failed": len(failures),
+        "results": sorted(results, key=lambda r: r["name"]),
+    }
+    with open(summary_path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2)
+    print(f"\n📄 Summary saved to {summary_path}")
+    return 1 if failures or partial else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,15 @@
 import uvicorn
 import socketio
 import asyncio
+import os
 import sys
+from functools import partial
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 from src.api.routes import router as api_router
 from src.agent.agent import run_agent
+from src.document import default_store_path
 
 # --- 1. Load Environment Variables ---
 load_dotenv()
@@ -31,11 +34,13 @@ app.add_middleware(
 app.include_router(api_router, prefix="/api", tags=["Agent"])
 
 # --- 5. Create Socket.IO Server ---
+# Per-frame logging is costly under load; set SOCKETIO_LOGGING=false to disable it.
+SOCKETIO_LOGGING = os.getenv("SOCKETIO_LOGGING", "true").lower() == "true"
 sio = socketio.AsyncServer(
     async_mode='asgi',
     cors_allowed_origins='*',
-    logger=True,
-    engineio_logger=True
+    logger=SOCKETIO_LOGGING,
+    engineio_logger=SOCKETIO_LOGGING
 )
 
 # --- 6. Define Socket.IO Event Handlers ---
@@ -50,6 +55,8 @@ async def disconnect(sid):
 @sio.on('start_agent')
 async def handle_start_agent(sid, data):
     project_path = data.get('project_path')
+    mode = data.get('mode', 'prefetched')
+    incremental = data.get('incremental', True)
     if not project_path:
         await sio.emit('log', {'level': 'ERROR', 'message': 'Project path not provided.'}, to=sid)
         return
@@ -84,8 +91,12 @@ async def handle_start_agent(sid, data):
         # Run the long-running, synchronous agent function in a separate thread
         doc, report = await loop.run_in_executor(
             None,
-            run_agent,
-            project_path
+            partial(
+                run_agent,
+                project_path,
+                mode=mode,
+                store_path=default_store_path(project_path) if incremental else None
+            )
         )
         
         # Restore stdout before sending the final result
@@ -1,29 +1,87 @@
+import os
+import re
 import time
-from typing import Optional, TypedDict,List
+from functools import lru_cache
+from typing import Callable, Optional, TypedDict,List
 from langchain import hub
 from langchain.agents import create_tool_calling_agent, AgentExecutor
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langgraph.graph import StateGraph, END
-from src.agent.tools import CodeAndMemoryTools
+from src.agent.tools import CodeAndMemoryTools, MEMORY_SEARCH_MAX_CHARS, MEMORY_SEARCH_MAX_RESULTS, MEMORY_SEARCH_MIN_SCORE
+from src.memory import memory_instance
 from google.api_core.exceptions import ServiceUnavailable
 from langchain_core.runnables import RunnableConfig
+from langchain_core.rate_limiters import BaseRateLimiter
 from langchain.callbacks.base import BaseCallbackHandler
 
 from src.agent.publisher_prompts import PUBLISHER_PROMPT_TEMPLATE
+from src.agent.writer_prompts import WRITER_PROMPT_TEMPLATE, REVISION_PROMPT_TEMPLATE, REVIEWER_PROMPT_TEMPLATE
+from src.agent.complexity import RoutingPolicy, compute_complexity, load_routing_policy
+from src.document import DocumentStore
 from langchain_core.output_parsers import StrOutputParser
 
+# --- Execution modes ---
+# "prefetched": the orchestrator loads the source up front and each node is a
+#               single prompt -> model call (no tool-calling loop).
+# "agent":      each node is a tool-calling AgentExecutor that reads the file itself.
+EXECUTION_MODES = ("prefetched", "agent")
+
+# A prefetched file is handed to the tool-calling agent when at least this many
+# of the project classes it imports have nothing in memory yet (typically
+# because they are documented later in the run): the agent can then read them
+# with `read_file_content`, which a single prompt cannot. File size is not a
+# reason to fall back, since the agent would read the same full source.
+AGENT_FALLBACK_MIN_DEPENDENCIES = 3
+
+# With a DocumentStore, regenerated sections are also written to disk at least
+# this often, so a killed process loses at most this much work.
+STORE_CHECKPOINT_SECONDS = 60
+
+_PACKAGE_RE = re.compile(r'^\s*package\s+([\w.]+)\s*;', re.MULTILINE)
+_IMPORT_RE = re.compile(r'^\s*import\s+([\w.]+)\s*;', re.MULTILINE)
+
 # --- AgentState and create_agent are the same ---
 class AgentState(TypedDict):
     project_path: str
     file_path: str
+    mode: str
+    source_code: str
+    related_context: str
+    model: str
+    max_revisions: int
+    review_enabled: bool
     draft_documentation: str
     review_feedback: str
     revision_number: int
+    error: str  # Last writer/reviewer failure for this file; cleared by a successful writer pass
+
+@lru_cache(maxsize=None)
+def get_chat_model(model: str, temperature: float, rate_limiter: Optional[BaseRateLimiter] = None) -> ChatGoogleGenerativeAI:
+    """
+    Returns a shared chat model client, so repeated runs in one process reuse it.
+    The `rate_limiter` is applied by LangChain to every model call the client makes,
+    including each step of a tool-calling agent.
+    """
+    return ChatGoogleGenerativeAI(
+        model=model,
+        temperature=temperature,
+        convert_system_message_to_human=True,
+        rate_limiter=rate_limiter
+    )
+
+def get_rate_limiter(config: Optional[RunnableConfig]) -> Optional[BaseRateLimiter]:
+    """The run's shared rate limiter, if one was passed in `configurable`."""
+    return (config or {}).get('configurable', {}).get('rate_limiter')
+
+@lru_cache(maxsize=None)
+def get_agent_prompt():
+    """Pulls the tool-calling agent prompt from the hub once per process."""
+    # This prompt is the standard for tool-calling agents and works well.
+    return hub.pull("hwchase17/openai-tools-agent")
 
 def create_agent(llm, tools):
     """Helper function to create a configured agent that uses native tool calling."""
-    # This prompt is the standard for tool-calling agents and works well.
-    prompt = hub.pull("hwchase17/openai-tools-agent")
+    prompt = get_agent_prompt()
     llm_with_tools = llm.bind_tools(tools)
     agent = create_tool_calling_agent(llm_with_tools, tools, prompt)
     return AgentExecutor(agent=agent, tools=tools, verbose=True, handle_parsing_errors=True)
@@ -35,6 +93,10 @@ def writer_agent_node(state: AgentState, config: Optional[RunnableConfig] = None
     print(f"\n--- ✍️ CALLING WRITER for: {file_path} ---")
     
     callbacks = config.get('callbacks') if config else None
+    rate_limiter = get_rate_limiter(config)
+    if state.get("mode") == "prefetched":
+        return _prefetched_writer(state, callbacks, rate_limiter)
+
     # *** THE FIX: Add a strong persona and behavioral rules to the prompt ***
     if state.get("review_feedback"):
         # This prompt for revisions is fine as it's highly specific.
@@ -60,17 +122,15 @@ def writer_agent_node(state: AgentState, config: Optional[RunnableConfig] = None
         user_input = f"""
         Generate a detailed, comprehensive Markdown documentation section for the following Java file: `{file_path}`.
         You MUST start by using the `read_file_content` tool to get the file's source code.
+        If it depends on other classes of the project, read them too when you need their details.
         Then, analyze the code and write the documentation.
         """
 
-    llm = ChatGoogleGenerativeAI(
-        model="gemini-2.5-flash", # Switched back to 1.5 Pro for better instruction following
-        temperature=0.2, 
-        convert_system_message_to_human=True,
-        system_message=system_prompt
-    )
+    # The system prompt travels with the input so the shared client can be reused;
+    # with convert_system_message_to_human the model sees the same human turn either way.
+    llm = get_chat_model(state.get("model", "gemini-2.5-flash"), 0.2, rate_limiter)
     
-    tools_instance = CodeAndMemoryTools(project_path=state["project_path"])
+    tools_instance = CodeAndMemoryTools(project_path=state["project_path"], current_file=file_path)
     tools = [
         tools_instance.read_file_content,
         tools_instance.save_to_memory,
@@ -80,16 +140,16 @@ def writer_agent_node(state: AgentState, config: Optional[RunnableConfig] = None
     writer_agent = create_agent(llm, tools)
     
     try:
-        result = writer_agent.invoke({"input": user_input, "chat_history": [("assistant", state['draft_documentation'])]}, config={"callbacks": callbacks})
-        return {"draft_documentation": result["output"], "revision_number": state.get("revision_number", 0) + 1}
+        result = writer_agent.invoke({"input": f"{system_prompt}\n{user_input}", "chat_history": [("assistant", state['draft_documentation'])]}, config={"callbacks": callbacks})
+        return {"draft_documentation": result["output"], "revision_number": state.get("revision_number", 0) + 1, "error": ""}
     except ServiceUnavailable as e:
         error_message = f"Network error during writer execution: {e}. Skipping."
         print(f"❌ {error_message}")
-        return {"draft_documentation": f"### ERROR: {error_message}", "revision_number": state.get("revision_number", 0) + 1}
+        return {"draft_documentation": f"### ERROR: {error_message}", "revision_number": state.get("revision_number", 0) + 1, "error": error_message}
     except Exception as e:
         error_message = f"An unexpected error occurred in writer: {e}. Skipping."
         print(f"❌ {error_message}")
-        return {"draft_documentation": f"### ERROR: {error_message}", "revision_number": state.get("revision_number", 0) + 1}
+        return {"draft_documentation": f"### ERROR: {error_message}", "revision_number": state.get("revision_number", 0) + 1, "error": error_message}
 
 
 def reviewer_agent_node(state: AgentState, config: Optional[RunnableConfig] = None):
@@ -98,6 +158,10 @@ def reviewer_agent_node(state: AgentState, config: Optional[RunnableConfig] = No
     print(f"\n--- 🧐 CALLING REVIEWER for: {file_path} ---")
 
     callbacks = config.get('callbacks') if config else None
+    rate_limiter = get_rate_limiter(config)
+    if state.get("mode") == "prefetched":
+        return _prefetched_reviewer(state, callbacks, rate_limiter)
+
     # *** THE FIX: Add a strong persona and behavioral rules to the reviewer as well ***
     system_prompt = """
     You are an autonomous AI code reviewer. Your sole purpose is to review a documentation draft against its source code.
@@ -109,12 +173,7 @@ def reviewer_agent_node(state: AgentState, config: Optional[RunnableConfig] = No
     4.  Your final answer MUST be ONLY the single word "APPROVED" or a bulleted list of feedback. Do not include conversational text.
     """
     
-    llm = ChatGoogleGenerativeAI(
-        model="gemini-2.5-flash", 
-        temperature=0, 
-        convert_system_message_to_human=True,
-        system_message=system_prompt
-    )
+    llm = get_chat_model(state.get("model", "gemini-2.5-flash"), 0, rate_limiter)
     
     tools_instance = CodeAndMemoryTools(project_path=state["project_path"])
     tools = [tools_instance.read_file_content]
@@ -133,54 +192,188 @@ def reviewer_agent_node(state: AgentState, config: Optional[RunnableConfig] = No
         {state['draft_documentation']}
         ```
         """
-        result = reviewer_agent.invoke({"input": user_input}, config={"callbacks": callbacks})
+        result = reviewer_agent.invoke({"input": f"{system_prompt}\n{user_input}"}, config={"callbacks": callbacks})
         return {"review_feedback": result["output"]}
     except ServiceUnavailable as e:
         error_message = f"Network error during reviewer execution: {e}. Approving to skip."
         print(f"❌ {error_message}")
-        return {"review_feedback": "APPROVED"}
+        return {"review_feedback": "APPROVED", "error": error_message}
+    except Exception as e:
+        error_message = f"An unexpected error occurred in reviewer: {e}. Approving to skip."
+        print(f"❌ {error_message}")
+        return {"review_feedback": "APPROVED", "error": error_message}
+
+# --- Single-shot nodes for the "prefetched" mode ---
+def _prefetched_writer(state: AgentState, callbacks, rate_limiter: Optional[BaseRateLimiter] = None):
+    """Writes or revises the draft with one model call, using the prefetched source."""
+    file_path = state['file_path']
+    llm = get_chat_model(state.get("model", "gemini-2.5-flash"), 0.2, rate_limiter)
+
+    if state.get("review_feedback"):
+        chain = REVISION_PROMPT_TEMPLATE | llm | StrOutputParser()
+        inputs = {
+            "file_path": file_path,
+            "review_feedback": state['review_feedback'],
+            "draft_documentation": state['draft_documentation'],
+            "source_code": state['source_code'],
+        }
+    else:
+        chain = WRITER_PROMPT_TEMPLATE | llm | StrOutputParser()
+        inputs = {
+            "file_path": file_path,
+            "related_context": state.get('related_context') or "None",
+            "source_code": state['source_code'],
+        }
+
+    try:
+        draft = chain.invoke(inputs, config={"callbacks": callbacks})
+        return {"draft_documentation": draft, "revision_number": state.get("revision_number", 0) + 1, "error": ""}
+    except ServiceUnavailable as e:
+        error_message = f"Network error during writer execution: {e}. Skipping."
+        print(f"❌ {error_message}")
+        return {"draft_documentation": f"### ERROR: {error_message}", "revision_number": state.get("revision_number", 0) + 1, "error": error_message}
+    except Exception as e:
+        error_message = f"An unexpected error occurred in writer: {e}. Skipping."
+        print(f"❌ {error_message}")
+        return {"draft_documentation": f"### ERROR: {error_message}", "revision_number": state.get("revision_number", 0) + 1, "error": error_message}
+
+
+def _prefetched_reviewer(state: AgentState, callbacks, rate_limiter: Optional[BaseRateLimiter] = None):
+    """Reviews the draft with one model call, using the prefetched source."""
+    llm = get_chat_model(state.get("model", "gemini-2.5-flash"), 0, rate_limiter)
+    chain = REVIEWER_PROMPT_TEMPLATE | llm | StrOutputParser()
+
+    try:
+        feedback = chain.invoke(
+            {
+                "file_path": state['file_path'],
+                "source_code": state['source_code'],
+                "draft_documentation": state['draft_documentation'],
+            },
+            config={"callbacks": callbacks}
+        )
+        return {"review_feedback": feedback}
+    except ServiceUnavailable as e:
+        error_message = f"Network error during reviewer execution: {e}. Approving to skip."
+        print(f"❌ {error_message}")
+        return {"review_feedback": "APPROVED", "error": error_message}
     except Exception as e:
         error_message = f"An unexpected error occurred in reviewer: {e}. Approving to skip."
         print(f"❌ {error_message}")
-        return {"review_feedback": "APPROVED"}
+        return {"review_feedback": "APPROVED", "error": error_message}
+
+
+def read_source(project_path: str, file_path: str) -> Optional[str]:
+    """
+    Loads a file's source before the graph runs, for complexity scoring and the
+    "prefetched" mode. Returns None when the file cannot be read.
+    """
+    full_path = os.path.join(project_path, file_path)
+    try:
+        with open(full_path, 'r', encoding='utf-8') as f:
+            return f.read()
+    except Exception as e:
+        print(f"⚠️ Could not read {file_path}: {e}")
+        return None
+
+def project_dependencies(source_code: str, project_files: List[str]) -> List[str]:
+    """
+    Project files the source imports, limited to the file's own base package (the
+    first two segments of its `package`). Imports that do not match a file of the
+    project (e.g. generated classes) are ignored.
+    """
+    package = _PACKAGE_RE.search(source_code)
+    if not package:
+        return []
+    base_package = ".".join(package.group(1).split(".")[:2]) + "."
+    by_path = {f.replace(os.sep, '/'): f for f in project_files}
+    dependencies = []
+    for name in _IMPORT_RE.findall(source_code):
+        if not name.startswith(base_package):
+            continue
+        suffix = "/" + name.replace('.', '/') + ".java"
+        dependencies.extend(f for path, f in by_path.items() if ("/" + path).endswith(suffix))
+    return dependencies
 
 # --- 4. The Graph Logic is the same ---
+def should_review(state: AgentState):
+    """Conditional edge after the writer: skip the reviewer for low-complexity files."""
+    if state.get("review_enabled", True):
+        return "review"
+    print("Review disabled for this file's routing tier. Ending process for this file.")
+    return "end"
+
 def should_continue(state: AgentState):
     """Conditional edge to decide whether to loop or end."""
     print("--- ⚖️ CHECKING REVIEW ---")
     feedback = state["review_feedback"]
     revision_number = state["revision_number"]
+    max_revisions = state.get("max_revisions", 3)
     
     if "APPROVED" in feedback.upper():
         print("Reviewer approved. Ending process for this file.")
         return "end"
     
-    if revision_number >= 3: 
+    if revision_number >= max_revisions: 
         print(f"Max revisions ({revision_number}) reached. Ending process for this file.")
         return "end"
     
     print("Feedback received. Returning to writer for revision.")
     return "continue"
 
-def run_agent(project_path: str,callbacks:List[BaseCallbackHandler]= None):
-    """
-    Orchestrates the entire documentation generation process, from file discovery
-    to final publishing.
-    """
-    print("=== Multi-Agent Orchestrator Start ===")
-    
-    # 1. Compile the reusable Writer/Reviewer agent graph
+@lru_cache(maxsize=None)
+def build_workflow():
+    """Compiles the reusable Writer/Reviewer agent graph once per process."""
     workflow = StateGraph(AgentState)
     workflow.add_node("writer", writer_agent_node)
     workflow.add_node("reviewer", reviewer_agent_node)
     workflow.set_entry_point("writer")
-    workflow.add_edge("writer", "reviewer")
+    workflow.add_conditional_edges(
+        "writer",
+        should_review,
+        {"review": "reviewer", "end": END}
+    )
     workflow.add_conditional_edges(
         "reviewer",
         should_continue,
         {"continue": "writer", "end": END}
     )
-    app = workflow.compile()
+    return workflow.compile()
+
+def run_agent(project_path: str,callbacks:List[BaseCallbackHandler]= None, mode: str = "prefetched",
+              routing_policy: Optional[RoutingPolicy] = None, rate_limiter: Optional[BaseRateLimiter] = None,
+              on_snippet: Optional[Callable[[str, str], None]] = None, store_path: Optional[str] = None):
+    """
+    Orchestrates the entire documentation generation process, from file discovery
+    to final publishing.
+
+    `mode` selects how the writer/reviewer nodes run: "prefetched" loads each
+    source file up front and calls the model once per node, falling back to the
+    tool-calling "agent" mode for files that cannot be read, or that import
+    several project classes with nothing in memory yet.
+
+    `routing_policy` maps each file's complexity score to a model, a revision cap
+    and whether it is reviewed at all. Defaults to `load_routing_policy()`.
+
+    `rate_limiter` (e.g. LangChain's InMemoryRateLimiter) is attached to every
+    chat model client of the run, so it paces each individual LLM call, also
+    across concurrent runs holding the same instance; when given, it replaces the
+    fixed pause between files. `on_snippet(file_path, snippet)` is called as soon as each
+    file is documented, so callers can stream results to disk.
+
+    `store_path` enables incremental publishing: sections are kept in a
+    DocumentStore persisted at that path, only files whose source changed since
+    the last run go through the graph, and the final document (with its table of
+    contents) is assembled locally instead of by the Publisher LLM. The store is
+    checkpointed during the run and saved even if the run fails partway.
+    """
+    if mode not in EXECUTION_MODES:
+        raise ValueError(f"Unknown execution mode: {mode}. Expected one of {EXECUTION_MODES}.")
+    routing_policy = routing_policy or load_routing_policy()
+    print(f"=== Multi-Agent Orchestrator Start (mode: {mode}) ===")
+    
+    # 1. Get the reusable Writer/Reviewer agent graph
+    app = build_workflow()
 
     # 2. Discover all files to be documented
     print("--- 🗺️ Discovering files in project... ---")
@@ -194,32 +387,170 @@ def run_agent(project_path: str,callbacks:List[BaseCallbackHandler]= None):
     except Exception as e:
         return f"Error listing files: {e}", {"status": "Failed", "feedback": "Could not list project files."}
 
+    store = None
+    if store_path:
+        store = DocumentStore.load(store_path, title=f"Technical Documentation for {os.path.basename(os.path.normpath(project_path))}")
+        removed = store.prune(files_to_document)
+        if removed:
+            print(f"--- 🗑️ Removed {len(removed)} sections for deleted files ---")
+
     # 3. Process each file in a loop to generate raw documentation snippets
     final_documentation_parts = []
-    for i, file_path in enumerate(files_to_document):
-        print("\n" + "="*50)
-        print(f"📄 Processing file {i+1}/{len(files_to_document)}: {file_path}")
-        print("="*50)
+    file_reports = []
+    regenerated = 0
+    last_saved = time.monotonic()
+    try:
+        for i, file_path in enumerate(files_to_document):
+            file_started = time.perf_counter()
+            print("\n" + "="*50)
+            print(f"📄 Processing file {i+1}/{len(files_to_document)}: {file_path}")
+            print("="*50)
         
-        initial_state = {
-            "project_path": project_path,
-            "file_path": file_path,
-            "draft_documentation": "",
-            "review_feedback": "",
-            "revision_number": 0
-        }
+            source_code = read_source(project_path, file_path)
+            complexity = compute_complexity(source_code) if source_code is not None else None
+            if store is not None and source_code is not None and store.is_current(file_path, source_code):
+                print("--- ♻️ Source unchanged since the last run. Reusing its section. ---")
+                # Memory is in-process only: re-seed it so changed files still get related context
+                # (a no-op when this process already holds the section)
+                memory_instance.add_content(store.get(file_path).content, metadata={"source": file_path, "project": project_path})
+                file_reports.append({
+                    "file_path": file_path,
+                    "complexity": complexity.model_dump(),
+                    "reused": True,
+                    "error": None,
+                    "seconds": round(time.perf_counter() - file_started, 2),
+                })
+                continue
+
+            if complexity is not None:
+                tier = routing_policy.route(complexity)
+                routed_by = "complexity"
+                print(f"--- 🧮 Complexity score {complexity.score} -> tier '{tier.name}' "
+                      f"(model: {tier.model}, max revisions: {tier.max_revisions}, review: {tier.review}) ---")
+            else:
+                tier = routing_policy.fallback()
+                routed_by = "fallback (unreadable source)"
+                print(f"--- 🧮 Source could not be scored -> fallback tier '{tier.name}' ---")
+
+            file_mode = mode
+            related_context = ""
+            if mode == "prefetched":
+                if source_code is None:
+                    print("--- 🔁 Source could not be prefetched. Falling back to the tool-calling agent ---")
+                    file_mode = "agent"
+                else:
+                    dependencies = project_dependencies(source_code, files_to_document)
+                    documented = memory_instance.known_sources(dependencies, project=project_path)
+                    missing = [d for d in dependencies if d not in documented]
+                    if len(missing) >= AGENT_FALLBACK_MIN_DEPENDENCIES:
+                        print(f"--- 🔁 {len(missing)} of {len(dependencies)} project dependencies are not in memory yet. "
+                              "Falling back to the tool-calling agent ---")
+                        file_mode = "agent"
+                    else:
+                        # Notes on the file's own dependencies are relevant by construction; without
+                        # any, only hits above the similarity threshold are worth the prompt space.
+                        related_context = "\n---\n".join(memory_instance.search_content(
+                            os.path.splitext(os.path.basename(file_path))[0],
+                            k=MEMORY_SEARCH_MAX_RESULTS,
+                            sources=sorted(documented) or None,
+                            project=project_path,
+                            exclude_sources=[file_path],
+                            mmr=True,
+                            score_threshold=None if documented else MEMORY_SEARCH_MIN_SCORE,
+                            max_chars=MEMORY_SEARCH_MAX_CHARS
+                        ))
+
+            initial_state = {
+                "project_path": project_path,
+                "file_path": file_path,
+                "mode": file_mode,
+                "source_code": source_code if file_mode == "prefetched" else "",
+                "related_context": related_context,
+                "model": tier.model,
+                "max_revisions": tier.max_revisions,
+                "review_enabled": tier.review,
+                "draft_documentation": "",
+                "review_feedback": "",
+                "revision_number": 0,
+                "error": ""
+            }
         
-        # Invoke the graph for this single file
-        final_state = app.invoke(initial_state, config={"callbacks": callbacks, "recursion_limit": 10})
-        # Add the approved documentation snippet to our list
-        snippet = final_state.get('draft_documentation', f"### Failed to document {file_path}\n")
-        # Add the file path as a header to each snippet for the publisher's context
-        final_documentation_parts.append(f"### File: `{file_path}`\n\n{snippet}")
-
-        # Pause to respect API rate limits, but not after the last file
-        if i < len(files_to_document) - 1:
-            print("\n--- ⏳ Pausing for 60 seconds to respect API rate limits... ---")
-            time.sleep(60)
+            # Invoke the graph for this single file. Each revision is a writer and a reviewer
+            # step, so the recursion limit follows the tier's revision cap.
+            try:
+                final_state = app.invoke(
+                    initial_state,
+                    config={
+                        "callbacks": callbacks,
+                        "recursion_limit": 2 * tier.max_revisions + 2,
+                        "configurable": {"rate_limiter": rate_limiter}
+                    }
+                )
+            except Exception as e:
+                error_message = f"Graph execution failed for {file_path}: {e}"
+                print(f"❌ {error_message}")
+                final_state = {"draft_documentation": f"### ERROR: {error_message}", "error": error_message}
+            # Add the approved documentation snippet to our list
+            snippet = final_state.get('draft_documentation', f"### Failed to document {file_path}\n")
+            error = final_state.get("error") or None
+            # Prefetched nodes have no memory tools, so the orchestrator remembers the result
+            if file_mode == "prefetched" and not error:
+                memory_instance.add_content(snippet, metadata={"source": file_path, "project": project_path})
+            if store is not None:
+                store.upsert(file_path, snippet, source_code or "", complete=source_code is not None and not error)
+                if time.monotonic() - last_saved >= STORE_CHECKPOINT_SECONDS:
+                    store.save(store_path)
+                    last_saved = time.monotonic()
+            if on_snippet is not None:
+                on_snippet(file_path, snippet)
+            # Add the file path as a header to each snippet for the publisher's context
+            final_documentation_parts.append(f"### File: `{file_path}`\n\n{snippet}")
+            regenerated += 1
+            file_reports.append({
+                "file_path": file_path,
+                "complexity": complexity.model_dump() if complexity is not None else None,
+                "tier": tier.name,
+                "routed_by": routed_by,
+                "model": tier.model,
+                "max_revisions": tier.max_revisions,
+                "review": tier.review,
+                "mode": file_mode,
+                "revisions": final_state.get("revision_number", 0),
+                "reused": False,
+                "error": error,
+                "seconds": round(time.perf_counter() - file_started, 2),
+            })
+
+            # Pause to respect API rate limits, but not after the last file.
+            # A shared rate limiter already paces every model call, so no fixed pause is needed.
+            if rate_limiter is None and i < len(files_to_document) - 1:
+                print("\n--- ⏳ Pausing for 60 seconds to respect API rate limits... ---")
+                time.sleep(60)
+    finally:
+        # Sections already paid for with LLM calls survive a failure partway through the run
+        if store is not None:
+            store.save(store_path)
+
+    failed_files = [f["file_path"] for f in file_reports if f["error"]]
+    if not failed_files:
+        status = "Complete"
+        feedback = f"Successfully processed and assembled documentation for {len(files_to_document)} files."
+    else:
+        status = "Failed" if len(failed_files) == len(files_to_document) else "Partial"
+        feedback = f"{len(failed_files)} of {len(files_to_document)} files failed: {', '.join(failed_files)}"
+    report = {
+        "status": status,
+        "feedback": feedback,
+        "files": file_reports
+    }
+
+    # 4a. Incremental publishing: the store already holds every section, so the
+    # document and its table of contents are rebuilt locally.
+    if store is not None:
+        print(f"\n📚 Assembled the document locally ({regenerated} regenerated, "
+              f"{len(files_to_document) - regenerated} reused).")
+        print("\n=== Orchestrator End ===")
+        return store.render(), report
 
     # 4. NEW: Call the Publisher Agent to assemble the final document
     print("\n" + "="*50)
@@ -230,7 +561,7 @@ def run_agent(project_path: str,callbacks:List[BaseCallbackHandler]= None):
     raw_snippets = "\n\n---\n\n".join(final_documentation_parts)
 
     # Create the Publisher Chain
-    publisher_llm = ChatGoogleGenerativeAI(model="gemini-2.5-flash", temperature=0.1, convert_system_message_to_human=True)
+    publisher_llm = get_chat_model("gemini-2.5-flash", 0.1, rate_limiter)
     publisher_chain = PUBLISHER_PROMPT_TEMPLATE | publisher_llm | StrOutputParser()
 
     # Invoke the Publisher to get the final, polished document
@@ -241,11 +572,9 @@ def run_agent(project_path: str,callbacks:List[BaseCallbackHandler]= None):
         print(f"❌ Error during publishing phase: {e}")
         print("⚠️ Falling back to returning raw, unorganized snippets.")
         final_document = "# Raw Documentation Snippets\n\n" + raw_snippets
-
-    report = {
-        "status": "Complete", 
-        "feedback": f"Successfully processed and assembled documentation for {len(files_to_document)} files."
-    }
+        report["publisher_error"] = str(e)
+        if report["status"] == "Complete":
+            report["status"] = "Partial"
 
     print("\n=== Orchestrator End ===")
     return final_document, report
\ No newline at end of file
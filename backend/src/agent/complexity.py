@@ -0,0 +1,125 @@
+import json
+import os
+import re
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+# --- Complexity scoring ---
+# A cheap, regex-based estimate computed before any LLM call. It does not need to
+# be exact; it only has to separate boilerplate (enums, DTOs, small interfaces)
+# from files that deserve a stronger model and a full review loop.
+
+# Weight of each signal in the final score.
+LINE_WEIGHT = 0.05        # per non-blank, non-comment line
+METHOD_WEIGHT = 1.0       # per method declaration
+ANNOTATION_WEIGHT = 0.25  # per annotation usage
+BRANCH_WEIGHT = 0.5       # per decision point (cyclomatic complexity - 1)
+FAN_OUT_WEIGHT = 0.5      # per import
+
+_COMMENT_RE = re.compile(r'/\*.*?\*/|//[^\n]*', re.DOTALL)
+_STRING_RE = re.compile(r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'')
+# Annotation arguments such as `@PathVariable("id")` or `@RequestParam(required = false)`
+# would otherwise end a method's parameter list early; only the annotation name is kept.
+_ANNOTATION_ARGS_RE = re.compile(r'(@[\w.]+)\s*\((?:[^()]|\([^()]*\))*\)')
+_METHOD_RE = re.compile(
+    r'^[ \t]*(?!(?:return|new|throw|else|if|for|while|switch|catch|do|try)\b)'
+    r'(?:(?:public|protected|private|static|final|abstract|synchronized|default|native)\s+)*'
+    r'(?:<(?:[^<>]|<(?:[^<>]|<[^<>]*>)*>)+>\s+)?[\w.<>\[\],?]+(?:\s*<[^;{()]*>)?\s+\w+\s*\([^;{)]*\)\s*'
+    r'(?:throws\s+[\w.,\s]+)?[{;]',
+    re.MULTILINE
+)
+_ANNOTATION_RE = re.compile(r'@(?!interface\b)\w+')
+# A ternary `?` is surrounded by spaces; a generic wildcard (`Map<String, ? extends Number>`)
+# follows `<` or `,` and is not counted.
+_BRANCH_RE = re.compile(r'\b(?:if|for|while|case|catch)\b|&&|\|\||(?<![<,])\s\?\s')
+_IMPORT_RE = re.compile(r'^\s*import\s+[\w.*]+\s*;', re.MULTILINE)
+
+
+class ComplexityScore(BaseModel):
+    lines: int = Field(description="Non-blank, non-comment lines.")
+    methods: int = Field(description="Number of method declarations.")
+    annotations: int = Field(description="Number of annotation usages.")
+    cyclomatic: int = Field(description="Approximate cyclomatic complexity of the whole file.")
+    fan_out: int = Field(description="Number of imported types (dependency fan-out).")
+    score: float = Field(description="Weighted sum of the signals above.")
+
+
+def compute_complexity(source_code: str) -> ComplexityScore:
+    """Scores a Java source file by size, structure and branching."""
+    code = _STRING_RE.sub('""', _COMMENT_RE.sub('', source_code))
+    code = _ANNOTATION_ARGS_RE.sub(r'\1', code)
+
+    lines = sum(1 for line in code.splitlines() if line.strip())
+    methods = len(_METHOD_RE.findall(code))
+    annotations = len(_ANNOTATION_RE.findall(code))
+    branches = len(_BRANCH_RE.findall(code))
+    fan_out = len(_IMPORT_RE.findall(code))
+
+    score = (
+        lines * LINE_WEIGHT
+        + methods * METHOD_WEIGHT
+        + annotations * ANNOTATION_WEIGHT
+        + branches * BRANCH_WEIGHT
+        + fan_out * FAN_OUT_WEIGHT
+    )
+    return ComplexityScore(
+        lines=lines,
+        methods=methods,
+        annotations=annotations,
+        cyclomatic=branches + 1,
+        fan_out=fan_out,
+        score=round(score, 2),
+    )
+
+
+# --- Routing policy ---
+class RoutingTier(BaseModel):
+    name: str
+    max_score: Optional[float] = Field(default=None, description="Inclusive upper bound of the tier; None means unbounded.")
+    model: str = Field(description="The model used by the writer and reviewer for files in this tier.")
+    max_revisions: int = Field(default=3, ge=1, description="Maximum number of writer passes before the file is accepted.")
+    review: bool = Field(default=True, description="Whether the reviewer runs at all for this tier.")
+
+
+class RoutingPolicy(BaseModel):
+    tiers: List[RoutingTier] = Field(description="Tiers ordered by increasing max_score; the last one should be unbounded.")
+    fallback_tier: str = Field(default="standard", description="Tier used for files that cannot be scored (e.g. unreadable source).")
+
+    def route(self, complexity: ComplexityScore) -> RoutingTier:
+        """Returns the first tier whose bound covers the score."""
+        for tier in self.tiers:
+            if tier.max_score is None or complexity.score <= tier.max_score:
+                return tier
+        return self.tiers[-1]
+
+    def fallback(self) -> RoutingTier:
+        """Returns the tier for files without a complexity score, or the last tier if it is not defined."""
+        for tier in self.tiers:
+            if tier.name == self.fallback_tier:
+                return tier
+        return self.tiers[-1]
+
+
+DEFAULT_ROUTING_POLICY = RoutingPolicy(
+    tiers=[
+        RoutingTier(name="trivial", max_score=8, model="gemini-2.5-flash-lite", max_revisions=1, review=False),
+        RoutingTier(name="standard", max_score=40, model="gemini-2.5-flash", max_revisions=2, review=True),
+        RoutingTier(name="complex", max_score=None, model="gemini-2.5-pro", max_revisions=3, review=True),
+    ]
+)
+
+
+def load_routing_policy(path: Optional[str] = None) -> RoutingPolicy:
+    """
+    Loads a routing policy from a JSON file (`{"tiers": [...]}`). The path defaults
+    to the ROUTING_POLICY_PATH environment variable; without either, the built-in
+    DEFAULT_ROUTING_POLICY is returned.
+    """
+    path = path or os.getenv("ROUTING_POLICY_PATH")
+    if not path:
+        return DEFAULT_ROUTING_POLICY
+    with open(path, 'r', encoding='utf-8') as f:
+        policy = RoutingPolicy(**json.load(f))
+    if not policy.tiers:
+        raise ValueError(f"Routing policy at {path} defines no tiers.")
+    return policy
@@ -27,4 +27,24 @@ class BroadcastingCallbackHandler(BaseCallbackHandler):
             "level": "OBSERVATION",
             "tool": name,
             "message": f"Output: {output[:200]}..." if len(output) > 200 else output
-        })
\ No newline at end of file
+        })
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages, **kwargs: Any) -> Any:
+        """Called before every model call, including the single-shot nodes of the prefetched mode."""
+        node = (kwargs.get("metadata") or {}).get("langgraph_node", "model")
+        model = (kwargs.get("invocation_params") or {}).get("model", "the model")
+        self._broadcast({
+            "level": "THOUGHT",
+            "message": f"{node.capitalize()} is calling {model}..."
+        })
+
+    def on_llm_end(self, response, **kwargs: Any) -> Any:
+        """Called when a model call finishes; tool-call steps without text are skipped."""
+        generations = response.generations[0] if response.generations else []
+        output = generations[0].text.strip() if generations else ""
+        if not output:
+            return
+        self._broadcast({
+            "level": "OBSERVATION",
+            "tool": "model",
+            "message": f"Output: {output[:200]}..." if len(output) > 200 else output
+        })
@@ -1,13 +1,22 @@
 import os
+from typing import Optional
 from langchain.tools import tool
 from src.memory import memory_instance # IMPORT the memory service
 from src.agent.tool_models import ReadFileArgs, WriteFileArgs, SaveMemoryArgs, SearchMemoryArgs, EmptyArgs # Import the models
 
+# Budget for search_memory results; keeps each tool observation (and the next writer call) small.
+MEMORY_SEARCH_MAX_RESULTS = 4
+MEMORY_SEARCH_MAX_CHARS = 3000
+# Minimum cosine similarity of a search_memory hit; below it a chunk is noise, not context.
+MEMORY_SEARCH_MIN_SCORE = 0.35
+
 class CodeAndMemoryTools:
-    def __init__(self, project_path: str):
+    def __init__(self, project_path: str, current_file: Optional[str] = None):
         if not os.path.isdir(project_path):
             raise ValueError(f"Project path does not exist: {project_path}")
         self.project_path = project_path
+        # The file being documented; its own notes are excluded from memory searches.
+        self.current_file = current_file
         
         # NOTE: Methods are decorated with @tool below. Do NOT re-wrap them here.
         # Create a bound, no-argument tool for listing Java files. Wrapping the
@@ -110,7 +119,7 @@ class CodeAndMemoryTools:
         The 'content' is what you want to remember, and 'source_file' is the file it came from.
         """
         # The tool now delegates to the memory service
-        memory_instance.add_content(content, metadata={"source": source_file})
+        memory_instance.add_content(content, metadata={"source": source_file, "project": self.project_path})
         return f"Successfully saved content from {source_file} to memory."
 
   
@@ -120,7 +129,15 @@ class CodeAndMemoryTools:
         Use this BEFORE documenting a file to get related context.
         """
         # The tool now delegates to the memory service
-        results = memory_instance.search_content(query)
+        results = memory_instance.search_content(
+            query,
+            k=MEMORY_SEARCH_MAX_RESULTS,
+            project=self.project_path,
+            exclude_sources=[self.current_file] if self.current_file else None,
+            mmr=True,
+            score_threshold=MEMORY_SEARCH_MIN_SCORE,
+            max_chars=MEMORY_SEARCH_MAX_CHARS
+        )
         if not results:
             return "No relevant information found in memory."
         return "\n---\n".join(results)
@@ -0,0 +1,89 @@
+from langchain_core.prompts import ChatPromptTemplate
+
+# Prompts for the "prefetched" execution mode. The orchestrator reads the source
+# file up front and injects it here, so the model answers in a single call
+# instead of spending a round trip deciding to call `read_file_content`.
+
+WRITER_PROMPT_TEMPLATE = ChatPromptTemplate.from_messages(
+    [
+        (
+            "system",
+            "You are an autonomous AI agent. Your sole purpose is to generate technical documentation for a given Java file. You MUST NOT ask for help, clarification, or direction. Your final answer MUST be only the generated Markdown documentation. Do not include any conversational text, questions, or introductory phrases."
+        ),
+        (
+            "human",
+            """
+            Generate a detailed, comprehensive Markdown documentation section for the Java file `{file_path}`.
+
+            **Related context from memory (may be empty):**
+            ---
+            {related_context}
+            ---
+
+            **Source code of `{file_path}`:**
+            ```java
+            {source_code}
+            ```
+
+            Now, analyze the code and write the documentation.
+            """
+        ),
+    ]
+)
+
+REVISION_PROMPT_TEMPLATE = ChatPromptTemplate.from_messages(
+    [
+        (
+            "system",
+            "You are an autonomous technical writer AI. Your task is to revise a draft of documentation for a Java file based on the provided feedback. Verify the feedback against the source code. DO NOT ask for clarification. Your final answer MUST be only the complete, revised Markdown documentation."
+        ),
+        (
+            "human",
+            """
+            Revise the documentation for `{file_path}` based on the feedback.
+
+            **Reviewer's Feedback to Address:**
+            ---
+            {review_feedback}
+            ---
+
+            **Current Draft:**
+            ```markdown
+            {draft_documentation}
+            ```
+
+            **Source code of `{file_path}`:**
+            ```java
+            {source_code}
+            ```
+            """
+        ),
+    ]
+)
+
+REVIEWER_PROMPT_TEMPLATE = ChatPromptTemplate.from_messages(
+    [
+        (
+            "system",
+            "You are an autonomous AI code reviewer. Your sole purpose is to review a documentation draft against its source code. You MUST NOT ask for help or clarification. Your final answer MUST be ONLY the single word \"APPROVED\" or a bulleted list of feedback. Do not include conversational text."
+        ),
+        (
+            "human",
+            """
+            Review the following documentation for the file `{file_path}` and verify its accuracy against the source code.
+            If it is accurate and complete, respond with "APPROVED".
+            Otherwise, provide feedback.
+
+            **Source code of `{file_path}`:**
+            ```java
+            {source_code}
+            ```
+
+            **Documentation to Review:**
+            ```markdown
+            {draft_documentation}
+            ```
+            """
+        ),
+    ]
+)
@@ -4,10 +4,13 @@ from typing import List, Dict, Any,Literal
 class DocumentationRequest(BaseModel):
     project_path: str
     max_iterations: int = 1
+    mode: Literal["prefetched", "agent"] = "prefetched"
+    incremental: bool = Field(default=True, description="Reuse sections of unchanged files and assemble the document locally.")
 
 class Report(BaseModel):
     status: str
     feedback: List[str] | str
+    files: List[Dict[str, Any]] = Field(default_factory=list, description="Per-file complexity scores and routing decisions.")
 
 class DocumentationResponse(BaseModel):
     documentation: str
@@ -1,9 +1,11 @@
 import asyncio
+from functools import partial
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from .models import DocumentationRequest
 from src.agent.agent import run_agent # Import your main agent function
 from .websocket_manager import manager
 from src.agent.streaming_callback import BroadcastingCallbackHandler
+from src.document import default_store_path
 
 router = APIRouter()
 
@@ -34,9 +36,13 @@ async def generate_documentation_endpoint(request: DocumentationRequest):
     # This prevents it from freezing the server.
     loop.run_in_executor(
         None,  # Use the default thread pool executor
-        run_agent,  # The synchronous function to run
-        request.project_path,  # The first argument for run_agent
-        [callback_handler]  # The second argument (callbacks)
+        partial(
+            run_agent,
+            request.project_path,
+            [callback_handler],
+            mode=request.mode,
+            store_path=default_store_path(request.project_path) if request.incremental else None
+        )
     )
     
     # Return an immediate response to the front end
@@ -0,0 +1 @@
+from .store import DocumentStore, Section, default_store_path
\ No newline at end of file
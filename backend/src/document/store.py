@@ -0,0 +1,285 @@
+import hashlib
+import json
+import os
+import re
+from typing import Dict, Iterator, List, Optional
+from pydantic import BaseModel, Field
+
+# Logical sections, in the standard Spring Boot order used by the publisher prompt.
+CATEGORY_ORDER = [
+    "Entities",
+    "Repositories",
+    "Services",
+    "Controllers",
+    "Configuration",
+    "Security",
+    "DTOs",
+    "Exceptions",
+    "Application Entrypoint",
+    "Tests",
+    "Other",
+]
+
+STORE_VERSION = 1
+
+_JAVA_ROOT_RE = re.compile(r'^(?:.*/)?src/(?:main|test)/java/')
+_HEADING_RE = re.compile(r'^(#{1,6})(\s)')
+_FENCE_RE = re.compile(r'^\s*(```|~~~)')
+
+
+def default_store_path(project_path: str) -> str:
+    """Where the server keeps a project's store: `DOC_STORE_DIR` (default ./data/doc_store), one JSON file per project."""
+    store_dir = os.getenv("DOC_STORE_DIR", "./data/doc_store")
+    return os.path.join(store_dir, f"{slugify(os.path.abspath(project_path))}.json")
+
+
+def slugify(text: str) -> str:
+    """Turns a path or title into a stable Markdown anchor."""
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')
+
+
+def source_hash(source_code: str) -> str:
+    """Fingerprint of a source file; a section is regenerated only when this changes."""
+    return hashlib.sha1(source_code.encode('utf-8')).hexdigest()
+
+
+def classify(file_path: str, source_code: str = "") -> str:
+    """Assigns a Java file to one of CATEGORY_ORDER using its path, name and annotations."""
+    path = file_path.replace(os.sep, '/')
+    lower_path = path.lower()
+    name = os.path.splitext(os.path.basename(path))[0]
+
+    if '/src/test/' in f'/{lower_path}' or re.search(r'(Test|Tests|IT)$', name):
+        return "Tests"
+    if '@SpringBootApplication' in source_code:
+        return "Application Entrypoint"
+    if name.endswith('Exception') or '@ControllerAdvice' in source_code or '@RestControllerAdvice' in source_code:
+        return "Exceptions"
+    if '@RestController' in source_code or '@Controller' in source_code or name.endswith('Controller'):
+        return "Controllers"
+    if '@Repository' in source_code or re.search(r'extends\s+\w*Repository\b', source_code) or name.endswith('Repository'):
+        return "Repositories"
+    if '@Service' in source_code or re.search(r'Service(Impl)?$', name):
+        return "Services"
+    if '/security/' in lower_path or re.search(r'Security|Jwt', name):
+        return "Security"
+    if '@Configuration' in source_code or '/config/' in lower_path or name.endswith(('Config', 'Configuration', 'Properties')):
+        return "Configuration"
+    if re.search(r'Dto$|DTO$|Request$|Response$', name) or '/dto/' in lower_path:
+        return "DTOs"
+    if re.search(r'@(Entity|Document|Table|Embeddable)\b', source_code) or re.search(r'/(entity|entities|model|domain)/', lower_path):
+        return "Entities"
+    return "Other"
+
+
+def package_of(file_path: str) -> str:
+    """Java package of a file, derived from its path (e.g. `com.example.user`)."""
+    path = _JAVA_ROOT_RE.sub('', file_path.replace(os.sep, '/'))
+    package = os.path.dirname(path).replace('/', '.')
+    return package or "default"
+
+
+def demote_headings(content: str, levels: int = 3) -> str:
+    """Pushes Markdown headings down so snippets nest under their file header (code fences are left alone)."""
+    lines = []
+    in_fence = False
+    for line in content.splitlines():
+        if _FENCE_RE.match(line):
+            in_fence = not in_fence
+        elif not in_fence:
+            line = _HEADING_RE.sub(lambda m: '#' * min(6, len(m.group(1)) + levels) + m.group(2), line)
+        lines.append(line)
+    return "\n".join(lines)
+
+
+class Section(BaseModel):
+    anchor: str = Field(description="Stable anchor derived from the file path.")
+    file_path: str
+    title: str
+    category: str
+    package: str
+    content: str = Field(description="Markdown documentation for the file, as produced by the writer.")
+    source_hash: Optional[str] = Field(default=None, description="Hash of the source the content was generated from; None forces regeneration.")
+
+
+class DocumentStore:
+    """
+    The generated documentation as a set of addressable sections, one per source
+    file, grouped into logical sections. Persisted as JSON so that a later run
+    regenerates only the files whose source changed; the table of contents and
+    the Markdown output are rebuilt locally without an LLM call.
+    """
+
+    def __init__(self, title: str, sections: Optional[Dict[str, Section]] = None):
+        self.title = title
+        self.sections: Dict[str, Section] = sections or {}
+
+    # --- Persistence ---
+    @classmethod
+    def load(cls, path: str, title: str = "") -> "DocumentStore":
+        """Loads a store from disk, or returns an empty one if the file does not exist or is outdated."""
+        if not os.path.exists(path):
+            return cls(title)
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get("version") != STORE_VERSION:
+            print(f"⚠️ Ignoring document store at {path} (version {data.get('version')}, expected {STORE_VERSION}).")
+            return cls(title)
+        sections = {s["anchor"]: Section(**s) for s in data.get("sections", [])}
+        return cls(title or data.get("title", ""), sections)
+
+    def save(self, path: str):
+        """Writes the store to disk atomically."""
+        data = {
+            "version": STORE_VERSION,
+            "title": self.title,
+            "sections": [section.model_dump() for section in self.sections.values()],
+        }
+        _atomic_write(path, [json.dumps(data, indent=2)])
+
+    # --- Section access ---
+    @staticmethod
+    def anchor_for(file_path: str) -> str:
+        return slugify(file_path.replace(os.sep, '/'))
+
+    def get(self, file_path: str) -> Optional[Section]:
+        return self.sections.get(self.anchor_for(file_path))
+
+    def is_current(self, file_path: str, source_code: str) -> bool:
+        """True when the stored section was generated from exactly this source."""
+        section = self.get(file_path)
+        return section is not None and section.source_hash == source_hash(source_code)
+
+    def upsert(self, file_path: str, content: str, source_code: str = "", complete: bool = True) -> Section:
+        """
+        Replaces (or adds) the section for a file. With `complete=False` (e.g. the
+        writer failed) the content is stored without a source hash, so the file is
+        regenerated on the next run.
+        """
+        section = Section(
+            anchor=self.anchor_for(file_path),
+            file_path=file_path,
+            title=os.path.splitext(os.path.basename(file_path))[0],
+            category=classify(file_path, source_code),
+            package=package_of(file_path),
+            content=content,
+            source_hash=source_hash(source_code) if complete else None,
+        )
+        self.sections[section.anchor] = section
+        return section
+
+    def prune(self, file_paths: List[str]) -> List[str]:
+        """Removes sections for files that no longer exist; returns their paths."""
+        keep = {self.anchor_for(f) for f in file_paths}
+        removed = [s.file_path for anchor, s in self.sections.items() if anchor not in keep]
+        self.sections = {anchor: s for anchor, s in self.sections.items() if anchor in keep}
+        return removed
+
+    def ordered_sections(self) -> Dict[str, List[Section]]:
+        """Sections grouped by logical category, in CATEGORY_ORDER, sorted by path inside each group."""
+        grouped = {category: [] for category in CATEGORY_ORDER}
+        for section in self.sections.values():
+            grouped.setdefault(section.category, []).append(section)
+        return {
+            category: sorted(sections, key=lambda s: s.file_path)
+            for category, sections in grouped.items() if sections
+        }
+
+    # --- Rendering ---
+    def _render_header(self) -> Iterator[str]:
+        yield f"# {self.title}\n\n"
+        yield (f"This document describes the {len(self.sections)} source files of the project, "
+               "grouped by their role in the application. Each file has a stable anchor, so "
+               "links survive when the documentation is regenerated.\n\n")
+
+    def render_toc(self, link_for=None) -> str:
+        """
+        Table of contents with links to every logical section and file section.
+        `link_for(section)` overrides file links (e.g. into per-package files), in
+        which case the logical sections are listed without links.
+        """
+        single_file = link_for is None
+        link_for = link_for or (lambda section: f"#{section.anchor}")
+        lines = ["## Table of Contents", ""]
+        for i, (category, sections) in enumerate(self.ordered_sections().items(), start=1):
+            lines.append(f"{i}. [{category}](#{slugify(category)})" if single_file else f"{i}. {category}")
+            for section in sections:
+                lines.append(f"    - [`{section.title}`]({link_for(section)})")
+        return "\n".join(lines) + "\n\n"
+
+    @staticmethod
+    def _render_section(section: Section) -> str:
+        return (f'<a id="{section.anchor}"></a>\n\n'
+                f"### `{section.title}`\n\n"
+                f"*File: `{section.file_path}`*\n\n"
+                f"{demote_headings(section.content.strip())}\n\n")
+
+    def iter_markdown(self) -> Iterator[str]:
+        """Yields the single-file Markdown document chunk by chunk."""
+        yield from self._render_header()
+        yield self.render_toc()
+        for category, sections in self.ordered_sections().items():
+            yield f'<a id="{slugify(category)}"></a>\n\n## {category}\n\n'
+            for section in sections:
+                yield self._render_section(section)
+
+    def render(self) -> str:
+        return "".join(self.iter_markdown())
+
+    def write_markdown(self, path: str):
+        """Streams the document to a single Markdown file."""
+        _atomic_write(path, self.iter_markdown())
+
+    def write_tree(self, directory: str) -> List[str]:
+        """
+        Writes one Markdown file per Java package plus an `index.md` holding the
+        title and the table of contents. Returns the written paths.
+        """
+        os.makedirs(directory, exist_ok=True)
+        by_package: Dict[str, List[Section]] = {}
+        for sections in self.ordered_sections().values():
+            for section in sections:
+                by_package.setdefault(section.package, []).append(section)
+
+        written = []
+        for package, sections in sorted(by_package.items()):
+            def package_chunks(package=package, sections=sections):
+                yield f"# Package `{package}`\n\n[Back to index](index.md)\n\n"
+                for section in sections:
+                    yield self._render_section(section)
+            path = os.path.join(directory, f"{package}.md")
+            _atomic_write(path, package_chunks())
+            written.append(path)
+
+        def index_chunks():
+            yield from self._render_header()
+            yield self.render_toc(link_for=lambda s: f"{s.package}.md#{s.anchor}")
+            yield "## Packages\n\n"
+            for package in sorted(by_package):
+                yield f"- [`{package}`]({package}.md)\n"
+        index_path = os.path.join(directory, "index.md")
+        _atomic_write(index_path, index_chunks())
+        written.append(index_path)
+
+        # Remove package files this store wrote for packages that no longer exist
+        expected = {os.path.basename(p) for p in written}
+        for name in os.listdir(directory):
+            stale_path = os.path.join(directory, name)
+            if name.endswith('.md') and name not in expected:
+                with open(stale_path, 'r', encoding='utf-8') as f:
+                    is_package_file = f.readline().startswith("# Package `")
+                if is_package_file:
+                    os.remove(stale_path)
+        return written
+
+
+def _atomic_write(path: str, chunks):
+    """Writes chunks to a temporary file and moves it into place, so readers never see a partial file."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        for chunk in chunks:
+            f.write(chunk)
+    os.replace(tmp_path, path)
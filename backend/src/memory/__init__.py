@@ -1 +1,7 @@
-from .vector_store import memory_instance
\ No newline at end of file
+def __getattr__(name):
+    # The memory singleton loads the embedding model, so it is only created when
+    # first requested; `src.memory.retrieval` can be imported without it.
+    if name == "memory_instance":
+        from .vector_store import memory_instance
+        return memory_instance
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
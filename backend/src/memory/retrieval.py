@@ -0,0 +1,89 @@
+import hashlib
+from typing import Iterable, Optional, TypedDict
+
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except Exception:  # tiktoken is optional; fall back to a chars-per-token estimate
+    _ENCODING = None
+
+
+class MemoryHit(TypedDict):
+    content: str
+    source: Optional[str]
+    score: float
+    metadata: dict
+
+
+def content_hash(content: str) -> str:
+    """Stable hash used to deduplicate identical chunks."""
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+
+def count_tokens(text: str) -> int:
+    """Counts tokens with tiktoken when available, otherwise estimates ~4 chars per token."""
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text))
+    return len(text) // 4 + 1
+
+
+def build_filter(sources: Optional[list[str]], project: Optional[str], exclude_sources: Optional[list[str]]) -> Optional[dict]:
+    """Builds a Chroma `where` clause from the metadata filters."""
+    conditions = []
+    if sources:
+        conditions.append({"source": {"$in": list(sources)}})
+    if project:
+        conditions.append({"project": project})
+    if exclude_sources:
+        conditions.append({"source": {"$nin": list(exclude_sources)}})
+    if not conditions:
+        return None
+    if len(conditions) == 1:
+        return conditions[0]
+    return {"$and": conditions}
+
+
+def select_hits(
+    results: dict,
+    order: Optional[Iterable[int]] = None,
+    k: Optional[int] = 3,
+    dedupe: bool = True,
+    score_threshold: Optional[float] = None,
+    max_chars: Optional[int] = None,
+    max_tokens: Optional[int] = None,
+) -> list[MemoryHit]:
+    """
+    Turns the result of a single-query `collection.query` into scored hits, visiting
+    candidates in `order` (default: by distance). Distances are squared L2 between
+    unit vectors, so the cosine similarity is `1 - d / 2`.
+    """
+    documents = results["documents"][0]
+    metadatas = results["metadatas"][0]
+    distances = results["distances"][0]
+
+    hits = []
+    seen_hashes = set()
+    used_chars = used_tokens = 0
+    for index in (range(len(documents)) if order is None else order):
+        content = documents[index]
+        metadata = metadatas[index] or {}
+        score = 1.0 - distances[index] / 2.0
+        if score_threshold is not None and score < score_threshold:
+            continue
+        if dedupe:
+            chunk_hash = metadata.get("content_hash") or content_hash(content)
+            if chunk_hash in seen_hashes:
+                continue
+            seen_hashes.add(chunk_hash)
+        if max_chars is not None and used_chars + len(content) > max_chars:
+            continue
+        if max_tokens is not None:
+            tokens = count_tokens(content)
+            if used_tokens + tokens > max_tokens:
+                continue
+            used_tokens += tokens
+        used_chars += len(content)
+        hits.append({"content": content, "source": metadata.get("source"), "score": round(score, 4), "metadata": metadata})
+        if k is not None and len(hits) >= k:
+            break
+    return hits
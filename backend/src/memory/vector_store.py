@@ -1,8 +1,16 @@
+from typing import Optional
+import numpy as np
 from langchain_community.embeddings import HuggingFaceEmbeddings
 from langchain_community.vectorstores import Chroma
+from langchain_community.vectorstores.utils import maximal_marginal_relevance
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 import chromadb
 
+from .retrieval import MemoryHit, build_filter, content_hash, select_hits
+
+COLLECTION_NAME = "code_documentation_memory"
+
+
 class AgentMemory:
     """
     A singleton class to manage the agent's vector store memory.
@@ -13,45 +21,132 @@ class AgentMemory:
         if cls._instance is None:
             print("Initializing Agent Memory...")
             cls._instance = super(AgentMemory, cls).__new__(cls)
-            
+
             # 1. SETUP EMBEDDINGS using Sentence Transformers (local and private)
             model_name = "all-MiniLM-L6-v2"  # A popular, fast, and effective model
             model_kwargs = {'device': 'cpu'} # Use 'cuda' for GPU
-            encode_kwargs = {'normalize_embeddings': False}
-            
+            encode_kwargs = {'normalize_embeddings': True} # Unit vectors, so L2 distance maps to cosine similarity
+
             embedding_function = HuggingFaceEmbeddings(
                 model_name=model_name,
                 model_kwargs=model_kwargs,
                 encode_kwargs=encode_kwargs
             )
-            
+            cls._instance.embedding_function = embedding_function
+
             # 2. SETUP VECTOR STORE (ChromaDB)
             client = chromadb.Client() # In-memory
-            
+
             cls._instance.vector_store = Chroma(
                 client=client,
-                collection_name="code_documentation_memory",
+                collection_name=COLLECTION_NAME,
                 embedding_function=embedding_function,
             )
-            
+            cls._instance.collection = client.get_collection(COLLECTION_NAME)
+
             # 3. SETUP TEXT SPLITTER
             cls._instance.text_splitter = RecursiveCharacterTextSplitter(
-                chunk_size=1000, 
+                chunk_size=1000,
                 chunk_overlap=100
             )
         return cls._instance
 
     def add_content(self, content: str, metadata: dict):
-        """Splits text and adds it to the vector store."""
+        """
+        Splits text and adds it to the vector store. Chunks already stored for the
+        same `source` and `project` are skipped, so re-adding unchanged content
+        neither grows the store nor pays for embeddings again.
+        """
         docs = self.text_splitter.create_documents([content], metadatas=[metadata])
+        for doc in docs:
+            doc.metadata = {**doc.metadata, "content_hash": content_hash(doc.page_content)}
+
+        source = metadata.get("source")
+        where = build_filter([source] if source else None, metadata.get("project"), None)
+        if where is not None:
+            existing = self.collection.get(where=where, include=["metadatas"])
+            known_hashes = {m.get("content_hash") for m in existing["metadatas"] if m}
+            docs = [doc for doc in docs if doc.metadata["content_hash"] not in known_hashes]
+        if not docs:
+            print(f"Content from '{source}' is already in memory.")
+            return
         self.vector_store.add_documents(docs)
-        print(f"Added content from '{metadata.get('source')}' to memory.")
+        print(f"Added content from '{source}' to memory.")
+
+    def search_with_scores(
+        self,
+        query: str,
+        k: Optional[int] = 3,
+        sources: Optional[list[str]] = None,
+        project: Optional[str] = None,
+        exclude_sources: Optional[list[str]] = None,
+        dedupe: bool = True,
+        mmr: bool = False,
+        lambda_mult: float = 0.5,
+        fetch_k: int = 20,
+        score_threshold: Optional[float] = None,
+        max_chars: Optional[int] = None,
+        max_tokens: Optional[int] = None,
+    ) -> list[MemoryHit]:
+        """
+        Queries the memory and returns scored hits.
+
+        Candidates (up to `fetch_k`) are restricted by `sources`, `project` and
+        `exclude_sources`, optionally reordered by maximal marginal relevance,
+        then deduplicated by content hash and dropped below `score_threshold`
+        (cosine similarity). Results stop at `k` hits and never exceed
+        `max_chars` / `max_tokens` in total; `k=None` relies on the budget alone.
+        """
+        total = self.collection.count()
+        if total == 0:
+            return []
+
+        query_embedding = self.embedding_function.embed_query(query)
+        include = ["documents", "metadatas", "distances"]
+        if mmr:
+            include.append("embeddings")
+        results = self.collection.query(
+            query_embeddings=[query_embedding],
+            n_results=min(fetch_k, total),
+            where=build_filter(sources, project, exclude_sources),
+            include=include,
+        )
+        if not results["documents"][0]:
+            return []
+
+        order = None
+        if mmr:
+            order = maximal_marginal_relevance(
+                np.array(query_embedding, dtype=np.float32),
+                results["embeddings"][0],
+                k=len(results["documents"][0]),
+                lambda_mult=lambda_mult,
+            )
+        hits = select_hits(
+            results,
+            order=order,
+            k=k,
+            dedupe=dedupe,
+            score_threshold=score_threshold,
+            max_chars=max_chars,
+            max_tokens=max_tokens,
+        )
+        used_chars = sum(len(hit["content"]) for hit in hits)
+
+        print(f"Querying memory for: '{query}' -> {len(hits)} hits "
+              f"(scores: {[hit['score'] for hit in hits]}, {used_chars} chars)")
+        return hits
+
+    def known_sources(self, sources: list[str], project: Optional[str] = None) -> set[str]:
+        """Which of `sources` have at least one chunk in memory (optionally within `project`)."""
+        if not sources:
+            return set()
+        existing = self.collection.get(where=build_filter(sources, project, None), include=["metadatas"])
+        return {m.get("source") for m in existing["metadatas"] if m} & set(sources)
 
-    def search_content(self, query: str, k: int = 3) -> list[str]:
-        """Queries the memory for relevant information."""
-        print(f"Querying memory for: '{query}'")
-        results = self.vector_store.similarity_search(query, k=k)
-        return [doc.page_content for doc in results]
+    def search_content(self, query: str, k: Optional[int] = 3, **kwargs) -> list[str]:
+        """Queries the memory for relevant information. See `search_with_scores` for the options."""
+        return [hit["content"] for hit in self.search_with_scores(query, k=k, **kwargs)]
 
 # Create a singleton instance for the rest of the application to use
-memory_instance = AgentMemory()
\ No newline at end of file
+memory_instance = AgentMemory()
@@ -0,0 +1,10 @@
+import sys
+from pathlib import Path
+
+# Ensure the repository root is on sys.path so `from src...` imports work
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+# Manual scripts that need a real project, an LLM or a running server.
+collect_ignore = ["test_agent.py", "load_test.py"]
@@ -0,0 +1,343 @@
+"""
+Load-test harness for the Socket.IO and WebSocket event layer.
+
+Starts the real server (`main.socket_app`) in a child process with a stub
+`run_agent` that emits synthetic events at a fixed rate, then drives simulated
+UI clients against it:
+
+  * Socket.IO clients emit `start_agent` and receive `log` events through the
+    stdout-redirecting emitter in `main.handle_start_agent`.
+  * WebSocket clients listen on `/api/ws/agent-feed` while stub runs started via
+    `POST /api/generate-documentation` call `ConnectionManager.broadcast` on the
+    callback handler's event loop.
+
+No LLM, embedding model or network access is needed. Reports delivery latency
+percentiles, dropped/misrouted messages, server event-loop lag, CPU and memory.
+
+Example:
+    python test/load_test.py --sio-clients 20 --sio-runs 5 --ws-clients 50 --ws-runs 2 --rate 50
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import resource
+import socket
+import sys
+import time
+import types
+from pathlib import Path
+
+# Ensure the repository root is on sys.path so `from src...` imports work
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+
+# --- 1. Server side (runs in the child process) ---
+def _install_stub_agent(events_per_run: int, rate: float, payload_bytes: int):
+    """Replaces `src.agent.agent` before `main` imports it, so no LLM or embeddings are loaded."""
+    padding = "x" * payload_bytes
+
+    def run_agent(project_path, callbacks=None, *args, **kwargs):
+        handler = callbacks[0] if callbacks else None
+        for seq in range(events_per_run):
+            event = json.dumps({"run": project_path, "seq": seq, "ts": time.time(), "pad": padding})
+            if handler is not None:
+                # WebSocket path: ConnectionManager.broadcast on the handler's loop. The
+                # handler's own on_tool_end truncates outputs over 200 chars, which
+                # would make padded events unparseable.
+                asyncio.run_coroutine_threadsafe(
+                    handler.manager.broadcast({"level": "OBSERVATION", "tool": "load_test", "message": event}),
+                    handler.loop
+                )
+            else:
+                # Socket.IO path: stdout is redirected to the client by main.handle_start_agent
+                print(event)
+            time.sleep(1.0 / rate)
+        return "# Stub Documentation", {"status": "Complete", "feedback": f"{events_per_run} synthetic events."}
+
+    stub = types.ModuleType("src.agent.agent")
+    stub.run_agent = run_agent
+    sys.modules["src.agent.agent"] = stub
+
+
+def _serve(port: int, options: dict, stats_queue, stop_event):
+    """Child process entry point: runs uvicorn and reports server-side stats on exit."""
+    log_file = open(options["server_log"], "a", buffering=1)
+    sys.stdout = log_file
+    sys.stderr = log_file
+    os.environ["SOCKETIO_LOGGING"] = "true" if options["sio_logging"] else "false"
+    _install_stub_agent(options["events_per_run"], options["rate"], options["payload_bytes"])
+
+    import uvicorn
+    import main
+
+    lag_samples = []
+
+    async def monitor_loop_lag(interval: float = 0.05):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(interval)
+            lag_samples.append(max(0.0, loop.time() - start - interval))
+
+    async def run():
+        config = uvicorn.Config(main.socket_app, host="127.0.0.1", port=port, log_level="warning", lifespan="off")
+        server = uvicorn.Server(config)
+        serve_task = asyncio.create_task(server.serve())
+        while not server.started:
+            await asyncio.sleep(0.05)
+
+        cpu_start = time.process_time()
+        rss_start = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        lag_task = asyncio.create_task(monitor_loop_lag())
+        stats_queue.put({"ready": True})
+
+        await asyncio.get_running_loop().run_in_executor(None, stop_event.wait)
+        lag_task.cancel()
+        stats_queue.put({
+            "cpu_seconds": time.process_time() - cpu_start,
+            "rss_start_mb": rss_start / 1024,
+            "rss_peak_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+            "loop_lag_ms": [lag * 1000 for lag in lag_samples],
+        })
+        server.should_exit = True
+        await serve_task
+
+    asyncio.run(run())
+
+
+# --- 2. Client side (runs in the parent process) ---
+class DeliveryStats:
+    def __init__(self):
+        self.latencies_ms = []
+        self.received = set()
+        self.duplicates = 0
+        self.misrouted = 0
+
+    def record(self, client_id: str, payload: dict):
+        key = (client_id, payload["run"], payload["seq"])
+        if key in self.received:
+            self.duplicates += 1
+            return
+        self.received.add(key)
+        self.latencies_ms.append((time.time() - payload["ts"]) * 1000)
+
+
+def _parse_event(message: str):
+    try:
+        payload = json.loads(message)
+    except (TypeError, ValueError):
+        return None
+    return payload if isinstance(payload, dict) and "seq" in payload else None
+
+
+async def _run_socketio_clients(base_url: str, args, stats: DeliveryStats):
+    import socketio
+
+    clients = []
+    finished = []
+    for i in range(args.sio_clients):
+        client = socketio.AsyncClient()
+        run_id = f"stub-sio-{i}" if i < args.sio_runs else None
+        client_id = f"sio-{i}"
+
+        def make_handlers(client_id=client_id, run_id=run_id):
+            done = asyncio.Event()
+
+            async def on_log(data):
+                payload = _parse_event(data.get("message"))
+                if payload is None:
+                    return
+                # Socket.IO events are addressed to the sid that started the run
+                if payload["run"] != run_id:
+                    stats.misrouted += 1
+                else:
+                    stats.record(client_id, payload)
+
+            async def on_final_result(data):
+                done.set()
+
+            return on_log, on_final_result, done
+
+        on_log, on_final_result, done = make_handlers()
+        client.on("log", on_log)
+        client.on("final_result", on_final_result)
+        await client.connect(base_url, transports=["websocket"])
+        clients.append(client)
+        if run_id is not None:
+            finished.append(done)
+            await client.emit("start_agent", {"project_path": run_id})
+    return clients, finished
+
+
+async def _run_websocket_clients(base_url: str, args, stats: DeliveryStats):
+    import aiohttp
+    import websockets
+
+    ws_url = base_url.replace("http://", "ws://") + "/api/ws/agent-feed"
+    connections = []
+    readers = []
+
+    async def read(client_id, connection):
+        try:
+            async for message in connection:
+                data = json.loads(message)
+                payload = _parse_event(data.get("message"))
+                if payload is not None:
+                    stats.record(client_id, payload)
+        except websockets.ConnectionClosed:
+            pass
+
+    for i in range(args.ws_clients):
+        connection = await websockets.connect(ws_url)
+        connections.append(connection)
+        readers.append(asyncio.create_task(read(f"ws-{i}", connection)))
+
+    async with aiohttp.ClientSession() as session:
+        for i in range(args.ws_runs):
+            async with session.post(f"{base_url}/api/generate-documentation", json={"project_path": f"stub-ws-{i}"}) as response:
+                response.raise_for_status()
+    return connections, readers
+
+
+def _percentiles(values: list, points=(50, 95, 99)) -> dict:
+    if not values:
+        return {f"p{p}": None for p in points} | {"max": None}
+    ordered = sorted(values)
+    result = {f"p{p}": round(ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))], 2) for p in points}
+    result["max"] = round(ordered[-1], 2)
+    return result
+
+
+async def _drive(base_url: str, args) -> dict:
+    sio_stats, ws_stats = DeliveryStats(), DeliveryStats()
+    client_cpu_start = time.process_time()
+    started = time.perf_counter()
+
+    sio_clients, sio_finished = await _run_socketio_clients(base_url, args, sio_stats)
+    ws_connections, ws_readers = await _run_websocket_clients(base_url, args, ws_stats)
+
+    # Every stub run takes events_per_run / rate seconds; allow a drain period on top.
+    deadline = args.events_per_run / args.rate + args.drain
+    try:
+        await asyncio.wait_for(asyncio.gather(*(done.wait() for done in sio_finished)), timeout=deadline)
+    except asyncio.TimeoutError:
+        pass
+    remaining = deadline - (time.perf_counter() - started)
+    if args.ws_runs and remaining > 0:
+        await asyncio.sleep(remaining)
+    else:
+        await asyncio.sleep(min(args.drain, 1.0))
+
+    for client in sio_clients:
+        await client.disconnect()
+    for connection in ws_connections:
+        await connection.close()
+    await asyncio.gather(*ws_readers, return_exceptions=True)
+
+    sio_expected = args.sio_runs * args.events_per_run
+    ws_expected = args.ws_clients * args.ws_runs * args.events_per_run
+    return {
+        "duration_seconds": round(time.perf_counter() - started, 2),
+        "client_cpu_seconds": round(time.process_time() - client_cpu_start, 2),
+        "socketio": {
+            "expected": sio_expected,
+            "delivered": len(sio_stats.received),
+            "dropped": sio_expected - len(sio_stats.received),
+            "misrouted": sio_stats.misrouted,
+            "duplicates": sio_stats.duplicates,
+            "latency_ms": _percentiles(sio_stats.latencies_ms),
+        },
+        "websocket": {
+            "expected": ws_expected,
+            "delivered": len(ws_stats.received),
+            "dropped": ws_expected - len(ws_stats.received),
+            "duplicates": ws_stats.duplicates,
+            "latency_ms": _percentiles(ws_stats.latencies_ms),
+        },
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Load-test the Socket.IO and WebSocket event layer with stub agent runs.")
+    parser.add_argument("--sio-clients", type=int, default=10, help="Simulated Socket.IO UI clients.")
+    parser.add_argument("--sio-runs", type=int, default=2, help="Socket.IO clients that also start a stub agent run.")
+    parser.add_argument("--ws-clients", type=int, default=10, help="Simulated /api/ws/agent-feed clients.")
+    parser.add_argument("--ws-runs", type=int, default=2, help="Stub agent runs started via /api/generate-documentation.")
+    parser.add_argument("--events-per-run", type=int, default=200, help="Synthetic events emitted by each stub run.")
+    parser.add_argument("--rate", type=float, default=20, help="Events per second emitted by each stub run.")
+    parser.add_argument("--payload-bytes", type=int, default=100, help="Padding added to each event.")
+    parser.add_argument("--drain", type=float, default=5, help="Extra seconds to wait for in-flight events.")
+    parser.add_argument("--sio-logging", choices=["on", "off"], default="on", help="Socket.IO/Engine.IO frame logging in the server.")
+    parser.add_argument("--server-log", default=os.devnull, help="File receiving the server's stdout/stderr.")
+    parser.add_argument("--json", help="Also write the results as JSON to this path.")
+    parser.add_argument("--max-drop-rate", type=float, default=0.0, help="Fail if the fraction of dropped events exceeds this.")
+    parser.add_argument("--max-p95-ms", type=float, help="Fail if any p95 delivery latency exceeds this.")
+    args = parser.parse_args(argv)
+    if args.sio_runs > args.sio_clients:
+        parser.error("--sio-runs cannot exceed --sio-clients")
+
+    port = _free_port()
+    options = {
+        "events_per_run": args.events_per_run,
+        "rate": args.rate,
+        "payload_bytes": args.payload_bytes,
+        "sio_logging": args.sio_logging == "on",
+        "server_log": args.server_log,
+    }
+    context = multiprocessing.get_context("spawn")
+    stats_queue, stop_event = context.Queue(), context.Event()
+    server = context.Process(target=_serve, args=(port, options, stats_queue, stop_event), daemon=True)
+    server.start()
+    try:
+        stats_queue.get(timeout=60)  # wait for "ready"
+        results = asyncio.run(_drive(f"http://127.0.0.1:{port}", args))
+        stop_event.set()
+        server_stats = stats_queue.get(timeout=30)
+    finally:
+        stop_event.set()
+        server.join(timeout=10)
+        if server.is_alive():
+            server.terminate()
+
+    results["server"] = {
+        "cpu_seconds": round(server_stats["cpu_seconds"], 2),
+        "rss_start_mb": round(server_stats["rss_start_mb"], 1),
+        "rss_peak_mb": round(server_stats["rss_peak_mb"], 1),
+        "loop_lag_ms": _percentiles(server_stats["loop_lag_ms"]),
+    }
+    results["config"] = vars(args)
+
+    print(json.dumps(results, indent=2))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    failures = []
+    for channel in ("socketio", "websocket"):
+        channel_stats = results[channel]
+        if channel_stats["expected"]:
+            drop_rate = channel_stats["dropped"] / channel_stats["expected"]
+            if drop_rate > args.max_drop_rate:
+                failures.append(f"{channel}: drop rate {drop_rate:.2%} exceeds {args.max_drop_rate:.2%}")
+            p95 = channel_stats["latency_ms"]["p95"]
+            if args.max_p95_ms is not None and p95 is not None and p95 > args.max_p95_ms:
+                failures.append(f"{channel}: p95 latency {p95}ms exceeds {args.max_p95_ms}ms")
+    for failure in failures:
+        print(f"❌ {failure}")
+    if not failures:
+        print("✅ Load test passed.")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
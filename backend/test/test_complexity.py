@@ -0,0 +1,134 @@
+import pytest
+
+from src.agent.complexity import (
+    DEFAULT_ROUTING_POLICY,
+    ComplexityScore,
+    RoutingPolicy,
+    RoutingTier,
+    compute_complexity,
+)
+
+CONTROLLER = '''
+package com.example.user;
+
+import java.util.List;
+import org.springframework.web.bind.annotation.*;
+
+/** Handles users; if this comment mentions for/while it must not count. */
+@RestController
+@RequestMapping("/users")
+public class UserController {
+    private final UserService service;
+
+    public UserController(UserService service) {
+        this.service = service;
+    }
+
+    @GetMapping("/{id}")
+    public User get(@PathVariable("id") Long id) {
+        return service.find(id);
+    }
+
+    @GetMapping
+    public List<User> search(@RequestParam(required = false) String name,
+                             @RequestParam(name = "page", defaultValue = "0") int page) {
+        if (name != null && !name.isEmpty()) {
+            return service.byName(name, page);
+        }
+        return page > 0 ? service.page(page) : service.all();
+    }
+}
+'''
+
+
+def test_counts_methods_with_annotated_parameters():
+    score = compute_complexity(CONTROLLER)
+    # constructor + get + search
+    assert score.methods == 3
+
+
+def test_counts_annotations_imports_and_branches():
+    score = compute_complexity(CONTROLLER)
+    assert score.annotations == 7
+    assert score.fan_out == 2
+    # if, &&, ternary
+    assert score.cyclomatic == 4
+
+
+def test_ignores_comments_and_string_literals():
+    source = '''
+    // if (a) { for (;;) {} }
+    /* while (true) */
+    class A {
+        String s = "if (x) { return y; }";
+    }
+    '''
+    score = compute_complexity(source)
+    assert score.cyclomatic == 1
+    assert score.methods == 0
+    assert score.lines == 3
+
+
+def test_empty_source_scores_zero():
+    score = compute_complexity("")
+    assert score.score == 0
+    assert score.lines == 0
+
+
+def test_larger_files_score_higher():
+    enum = "public enum Status { ACTIVE, INACTIVE }"
+    assert compute_complexity(CONTROLLER).score > compute_complexity(enum).score
+
+
+def _score(value: float) -> ComplexityScore:
+    return ComplexityScore(lines=0, methods=0, annotations=0, cyclomatic=1, fan_out=0, score=value)
+
+
+@pytest.mark.parametrize("value, expected", [(0, "trivial"), (8, "trivial"), (8.01, "standard"), (40, "standard"), (500, "complex")])
+def test_default_policy_routes_by_score(value, expected):
+    assert DEFAULT_ROUTING_POLICY.route(_score(value)).name == expected
+
+
+def test_route_uses_last_tier_when_all_tiers_are_bounded():
+    policy = RoutingPolicy(tiers=[
+        RoutingTier(name="small", max_score=1, model="m1"),
+        RoutingTier(name="medium", max_score=2, model="m2"),
+    ])
+    assert policy.route(_score(10)).name == "medium"
+
+
+def test_fallback_tier():
+    assert DEFAULT_ROUTING_POLICY.fallback().name == "standard"
+    policy = RoutingPolicy(
+        tiers=[RoutingTier(name="only", model="m")],
+        fallback_tier="missing",
+    )
+    assert policy.fallback().name == "only"
+
+
+def test_tier_needs_at_least_one_writer_pass():
+    with pytest.raises(ValueError):
+        RoutingTier(name="broken", model="m", max_revisions=0)
+
+
+def test_counts_bounded_generic_methods():
+    source = '''
+public class Collections2 {
+    public static <T extends Comparable<T>> T max(List<T> xs) {
+        return xs.get(0);
+    }
+    <K, V extends Map<K, List<V>>> void merge(V into) {}
+}
+'''
+    assert compute_complexity(source).methods == 2
+
+
+def test_generic_wildcards_are_not_branches():
+    source = '''
+public class Stats {
+    private Map<String, ? extends Number> totals;
+    public void add(List<? super Integer> values, Map<String, ? extends Number> other) {}
+    public int sign(int x) { return x > 0 ? 1 : -1; }
+}
+'''
+    assert compute_complexity(source).cyclomatic == 2
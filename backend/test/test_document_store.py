@@ -0,0 +1,133 @@
+import json
+
+import pytest
+
+from src.document import DocumentStore
+from src.document.store import STORE_VERSION, classify, demote_headings, package_of, slugify
+
+CONTROLLER = "src/main/java/com/example/user/UserController.java"
+ENTITY = "src/main/java/com/example/user/User.java"
+SERVICE = "src/main/java/com/example/order/OrderService.java"
+
+
+@pytest.mark.parametrize("file_path, source, expected", [
+    ("src/test/java/com/example/UserServiceTest.java", "@Service", "Tests"),
+    ("src/main/java/com/example/App.java", "@SpringBootApplication public class App {}", "Application Entrypoint"),
+    ("src/main/java/com/example/web/GlobalHandler.java", "@RestControllerAdvice class GlobalHandler {}", "Exceptions"),
+    ("src/main/java/com/example/UserNotFoundException.java", "", "Exceptions"),
+    (CONTROLLER, "@RestController class UserController {}", "Controllers"),
+    ("src/main/java/com/example/UserRepository.java", "interface UserRepository extends JpaRepository<User, Long> {}", "Repositories"),
+    ("src/main/java/com/example/OrderServiceImpl.java", "", "Services"),
+    ("src/main/java/com/example/config/SecurityConfig.java", "@Configuration class SecurityConfig {}", "Security"),
+    ("src/main/java/com/example/config/AppConfig.java", "@Configuration class AppConfig {}", "Configuration"),
+    ("src/main/java/com/example/dto/UserDto.java", "", "DTOs"),
+    (ENTITY, "@Entity public class User {}", "Entities"),
+    ("src/main/java/com/example/util/Strings.java", "class Strings {}", "Other"),
+])
+def test_classify(file_path, source, expected):
+    assert classify(file_path, source) == expected
+
+
+def test_package_and_anchor_are_derived_from_the_path():
+    assert package_of(CONTROLLER) == "com.example.user"
+    assert package_of("Loose.java") == "default"
+    assert DocumentStore.anchor_for(CONTROLLER) == "src-main-java-com-example-user-usercontroller-java"
+    assert slugify("Application Entrypoint") == "application-entrypoint"
+
+
+def test_demote_headings_leaves_code_fences_alone():
+    content = "# Title\ntext\n```java\n# not a heading\n```\n## Sub\n###### Deep"
+    assert demote_headings(content) == "#### Title\ntext\n```java\n# not a heading\n```\n##### Sub\n###### Deep"
+
+
+def test_is_current_tracks_source_hash():
+    store = DocumentStore("Docs")
+    store.upsert(ENTITY, "# User", "@Entity class User {}")
+    assert store.is_current(ENTITY, "@Entity class User {}")
+    assert not store.is_current(ENTITY, "@Entity class User { int id; }")
+    assert not store.is_current(CONTROLLER, "anything")
+
+
+def test_incomplete_upsert_is_regenerated_next_time():
+    store = DocumentStore("Docs")
+    store.upsert(ENTITY, "### ERROR: quota", "@Entity class User {}", complete=False)
+    assert store.get(ENTITY).content == "### ERROR: quota"
+    assert not store.is_current(ENTITY, "@Entity class User {}")
+
+
+def test_prune_removes_deleted_files():
+    store = DocumentStore("Docs")
+    store.upsert(ENTITY, "# User", "@Entity class User {}")
+    store.upsert(CONTROLLER, "# Controller", "@RestController class UserController {}")
+    assert store.prune([CONTROLLER]) == [ENTITY]
+    assert store.get(ENTITY) is None
+    assert store.get(CONTROLLER) is not None
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = tmp_path / "store.json"
+    store = DocumentStore("Docs")
+    store.upsert(ENTITY, "# User", "@Entity class User {}")
+    store.save(str(path))
+
+    loaded = DocumentStore.load(str(path))
+    assert loaded.title == "Docs"
+    assert loaded.is_current(ENTITY, "@Entity class User {}")
+    assert not (tmp_path / "store.json.tmp").exists()
+
+
+def test_load_ignores_missing_or_outdated_store(tmp_path):
+    assert DocumentStore.load(str(tmp_path / "missing.json"), title="T").sections == {}
+
+    path = tmp_path / "old.json"
+    path.write_text(json.dumps({"version": STORE_VERSION + 1, "sections": [{"anchor": "x"}]}))
+    assert DocumentStore.load(str(path), title="T").sections == {}
+
+
+def test_render_orders_sections_and_builds_toc():
+    store = DocumentStore("Docs")
+    store.upsert(CONTROLLER, "# Controller", "@RestController class UserController {}")
+    store.upsert(ENTITY, "# User", "@Entity class User {}")
+    markdown = store.render()
+
+    assert markdown.startswith("# Docs\n")
+    assert markdown.index("## Entities") < markdown.index("## Controllers")
+    assert "1. [Entities](#entities)" in markdown
+    assert f"[`UserController`](#{DocumentStore.anchor_for(CONTROLLER)})" in markdown
+    assert f'<a id="{DocumentStore.anchor_for(ENTITY)}"></a>' in markdown
+
+
+def test_write_markdown(tmp_path):
+    store = DocumentStore("Docs")
+    store.upsert(ENTITY, "# User", "@Entity class User {}")
+    path = tmp_path / "out" / "FINAL_DOCUMENTATION.md"
+    store.write_markdown(str(path))
+    assert path.read_text(encoding="utf-8") == store.render()
+
+
+def test_write_tree_links_into_package_files(tmp_path):
+    store = DocumentStore("Docs")
+    store.upsert(ENTITY, "# User", "@Entity class User {}")
+    store.upsert(SERVICE, "# Orders", "@Service class OrderService {}")
+    written = store.write_tree(str(tmp_path))
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["com.example.order.md", "com.example.user.md", "index.md"]
+    assert len(written) == 3
+    index = (tmp_path / "index.md").read_text(encoding="utf-8")
+    assert f"(com.example.user.md#{DocumentStore.anchor_for(ENTITY)})" in index
+    assert "1. Entities" in index
+
+
+def test_write_tree_removes_only_its_own_stale_files(tmp_path):
+    store = DocumentStore("Docs")
+    store.upsert(ENTITY, "# User", "@Entity class User {}")
+    store.upsert(SERVICE, "# Orders", "@Service class OrderService {}")
+    store.write_tree(str(tmp_path))
+    (tmp_path / "NOTES.md").write_text("# My own notes\n")
+
+    store.prune([ENTITY])
+    store.write_tree(str(tmp_path))
+
+    assert not (tmp_path / "com.example.order.md").exists()
+    assert (tmp_path / "com.example.user.md").exists()
+    assert (tmp_path / "NOTES.md").read_text() == "# My own notes\n"
@@ -0,0 +1,73 @@
+import pytest
+
+from src.memory.retrieval import build_filter, content_hash, count_tokens, select_hits
+
+
+def query_results(*candidates):
+    """Builds the shape `collection.query` returns for one query from (content, distance, metadata) tuples."""
+    return {
+        "documents": [[content for content, _, _ in candidates]],
+        "distances": [[distance for _, distance, _ in candidates]],
+        "metadatas": [[metadata for _, _, metadata in candidates]],
+    }
+
+
+def test_build_filter_without_conditions():
+    assert build_filter(None, None, None) is None
+    assert build_filter([], "", []) is None
+
+
+def test_build_filter_single_conditions():
+    assert build_filter(["A.java"], None, None) == {"source": {"$in": ["A.java"]}}
+    assert build_filter(None, "/srv/shop", None) == {"project": "/srv/shop"}
+    assert build_filter(None, None, ["B.java"]) == {"source": {"$nin": ["B.java"]}}
+
+
+def test_build_filter_combines_conditions_with_and():
+    assert build_filter(["A.java"], "/srv/shop", ["B.java"]) == {"$and": [
+        {"source": {"$in": ["A.java"]}},
+        {"project": "/srv/shop"},
+        {"source": {"$nin": ["B.java"]}},
+    ]}
+
+
+@pytest.mark.parametrize("distance, score", [(0.0, 1.0), (1.0, 0.5), (2.0, 0.0), (4.0, -1.0)])
+def test_score_is_cosine_similarity_of_unit_vectors(distance, score):
+    hits = select_hits(query_results(("text", distance, {"source": "A.java"})))
+    assert hits[0]["score"] == score
+    assert hits[0]["source"] == "A.java"
+
+
+def test_hits_follow_the_given_order_and_stop_at_k():
+    results = query_results(("a", 0.1, {}), ("b", 0.2, {}), ("c", 0.3, {}))
+    assert [h["content"] for h in select_hits(results, k=2)] == ["a", "b"]
+    assert [h["content"] for h in select_hits(results, order=[2, 0, 1], k=2)] == ["c", "a"]
+    assert len(select_hits(results, k=None)) == 3
+
+
+def test_duplicates_are_dropped_by_content_hash():
+    results = query_results(
+        ("same", 0.1, {"content_hash": content_hash("same")}),
+        ("same", 0.2, None),
+        ("other", 0.3, {}),
+    )
+    assert [h["content"] for h in select_hits(results, k=None)] == ["same", "other"]
+    assert len(select_hits(results, k=None, dedupe=False)) == 3
+
+
+def test_score_threshold_drops_weak_hits():
+    results = query_results(("close", 0.2, {}), ("far", 1.6, {}))
+    assert [h["content"] for h in select_hits(results, score_threshold=0.5)] == ["close"]
+
+
+def test_char_budget_skips_chunks_that_do_not_fit():
+    results = query_results(("x" * 60, 0.1, {}), ("y" * 60, 0.2, {}), ("z" * 30, 0.3, {}))
+    hits = select_hits(results, k=None, max_chars=100)
+    assert [h["content"][0] for h in hits] == ["x", "z"]
+
+
+def test_token_budget():
+    text = "word " * 20
+    results = query_results((text, 0.1, {}), (text + "more", 0.2, {}))
+    hits = select_hits(results, k=None, max_tokens=count_tokens(text))
+    assert [h["content"] for h in hits] == [text]